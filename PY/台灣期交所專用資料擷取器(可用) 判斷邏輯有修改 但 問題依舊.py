@@ -13,13 +13,117 @@ import json
 import csv
 import threading
 from urllib.parse import urljoin, urlparse
-import yfinance as yf
 from typing import Dict, List, Any, Optional
 
 # 創建Data資料夾
 if not os.path.exists('Data'):
     os.makedirs('Data')
 
+# 台股市場資料網址清單（分類整理）
+_TAIWAN_MARKET_URLS = {
+    # === 高頻資料 (HF) ===
+    "HF-選擇權日報表": "https://www.taifex.com.tw/cht/3/optDailyMarketReport",
+    "HF-期貨日報表": "https://www.taifex.com.tw/cht/3/dlFutDailyMarketView",
+    
+    # === 選擇權資料 ===
+    "選擇權-未平倉餘額": "https://www.taifex.com.tw/cht/3/optContractsDate",
+    "選擇權-日報表": "https://www.taifex.com.tw/cht/3/optDailyMarketReport", 
+    "選擇權-歷史資料": "https://www.taifex.com.tw/cht/3/optPrevious30DaysSalesData",
+    "選擇權-買賣權分計": "https://www.taifex.com.tw/cht/3/callsAndPutsDate",
+    
+    # === 期貨資料 ===
+    "期貨-日報表": "https://www.taifex.com.tw/cht/3/futDailyMarketReport",
+    "期貨-歷史資料": "https://www.taifex.com.tw/cht/3/futPrevious30DaysSalesData",
+    "期貨-未平倉餘額": "https://www.taifex.com.tw/cht/3/futContractsDate",
+    
+    # === 三大法人 ===
+    "法人-期貨未平倉": "https://www.taifex.com.tw/cht/3/futContractsDate",
+    "法人-選擇權未平倉": "https://www.taifex.com.tw/cht/3/optContractsDate",
+    "法人-外資未平倉": "https://www.taifex.com.tw/cht/3/internationalTreats",
+    
+    # === 盤後資料下載 ===
+    "盤後-期貨資料": "https://www.taifex.com.tw/cht/3/dlFutDataDown",
+    "盤後-選擇權資料": "https://www.taifex.com.tw/cht/3/dlOptDataDown",
+    "盤後-每筆成交": "https://www.taifex.com.tw/cht/3/dlFutTxfDown",
+    
+    # === 指數與波動率 ===
+    "指數-波動率指數": "https://www.taifex.com.tw/cht/7/vixChart",
+    "指數-盤後行情": "https://www.taifex.com.tw/cht/3/futMarketReport",
+    
+    # === 證交所資料 ===
+    "證交所-個股日成交": "https://www.twse.com.tw/zh/page/trading/exchange/STOCK_DAY.html",
+    "證交所-三大法人": "https://www.twse.com.tw/zh/page/trading/fund/BFI82U.html",
+    "證交所-融資融券": "https://www.twse.com.tw/zh/page/trading/exchange/MI_MARGN.html",
+    "證交所-股價指數": "https://www.twse.com.tw/zh/page/trading/indices/MI_5MINS_HIST.html",
+    "證交所-個股週轉率": "https://www.twse.com.tw/zh/page/trading/exchange/STOCK_DAY_AVG.html",
+    
+    # === 櫃買中心 ===
+    "櫃買-個股日成交": "https://www.tpex.org.tw/web/stock/aftertrading/daily_trading_info/st43_result.php",
+    "櫃買-三大法人": "https://www.tpex.org.tw/web/stock/3insti/3insti_summary/3itrdsum_result.php",
+    
+    # === 公開資訊觀測站 ===
+    "公開資訊-財務報表": "https://mops.twse.com.tw/mops/web/t51sb01",
+    
+    # === Yahoo Finance ===
+    "YF-台股大盤": "https://finance.yahoo.com/quote/%5ETWII/history/",
+    "YF-台積電": "https://finance.yahoo.com/quote/2330.TW/history/",
+    "YF-聯發科": "https://finance.yahoo.com/quote/2454.TW/history/",
+    "YF-鴻海": "https://finance.yahoo.com/quote/2317.TW/history/"
+}
+
+# HTTP請求標頭
+_REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'zh-TW,zh;q=0.9,en;q=0.8',
+}
+
+# 依副檔名對應的DataFrame匯出函式（CSV以分塊方式寫入，降低大量資料的記憶體峰值）
+# CSV不指定lineterminator（pandas 1.5前名為line_terminator，舊版會TypeError）；
+# 也不傳columns=：全部欄位時pandas會先以df.loc[:, columns]複製整個DataFrame，反而增加記憶體
+_EXPORTERS = {
+    '.csv': lambda df, path: df.to_csv(path, index=False, encoding='utf-8-sig', chunksize=65536),
+    '.xlsx': lambda df, path: df.to_excel(path, index=False),
+    '.json': lambda df, path: df.to_json(path, orient='records', force_ascii=False, indent=2),
+}
+
+# 股票代號辨識：在字串中尋找「空格或開頭 + 數字代號 + 空格 + 中文名稱」
+# (?:\s|^) → 空格或字串開頭（非捕獲組）
+# (\d{3,6}[A-Za-z]*) → 3-6位數字，可能包含英文（股票代號）
+# \s+ → 1個或多個空格
+# ([\u4e00-\u9fff]+) → 中文名稱
+_SYMBOL_PATTERN = re.compile(r'(?:\s|^)(\d{3,6}[A-Za-z]*)\s+([\u4e00-\u9fff]+)')
+# 台股代號格式：必須以數字開頭，可能包含英文
+_SYMBOL_FORMAT = re.compile(r'^\d+[A-Za-z]*$')
+
+# === CSV資料分類關鍵字（不變的常數，每批資料共用） ===
+# 欄位名稱直接比對：各類資料的代表欄位
+_OPTION_INDICATORS = frozenset({'cp', 'call/put', '買賣權', 'strike', '履約價', 'expiry', '到期'})
+_FUTURE_INDICATORS = frozenset({'settlement', '結算價', 'oi', '未平倉', '留倉'})
+_STOCK_INDICATORS = frozenset({'open', 'high', 'low', 'close', 'volume', 'value', '成交金額', '開盤', '最高', '最低', '收盤', '成交量'})
+
+# 常見的股票資料欄位關鍵字
+_STOCK_KEYWORDS = frozenset({
+    'open', 'high', 'low', 'close', 'volume', 'value',
+    '開盤', '最高', '最低', '收盤', '成交量', '成交金額',
+    '日期', 'date', '代號', 'symbol', '名稱', 'name'
+})
+
+# 常見的選擇權/期貨欄位關鍵字
+_OPTION_FUTURE_KEYWORDS = frozenset({
+    'cp', 'call', 'put', 'strike', '履約價', 'expiry', '到期',
+    'settlement', '結算價', 'oi', '未平倉', '留倉'
+})
+
+# 常見的非欄位名稱文字（文字說明）
+_NON_COLUMN_KEYWORDS = frozenset({
+    '報告', '報表', '資料', '統計', '明細', '表', '年度', '月份',
+    '公司', '股票', '證券', '交易', '市場', '行情', '投資'
+})
+
+# 查詢結果每頁顯示的筆數（其餘資料點選「顯示下一頁」再載入）
+_QUERY_PAGE_SIZE = 500
+
 class FinancialDatabase:
     """金融資料庫管理系統"""
     
@@ -136,44 +240,21 @@ class FinancialDatabase:
             logging.error(f"恢復正常設定失敗: {e}")
     
     # === 快速批次插入方法 ===
-    def batch_insert_options_fast(self, options_list: List[Dict[str, Any]]) -> int:
-        """快速批次插入選擇權資料 - 針對大量資料優化"""
-        if not options_list:
-            return 0
-        
+    def _batch_insert_fast(self, insert_sql: str, data_tuples: List[tuple], label: str) -> int:
+        """共用的快速批次插入流程：調整PRAGMA、單一事務executemany、完成後恢復設定"""
+        conn = self._get_connection()
         try:
-            conn = self._get_connection()
             cursor = conn.cursor()
             
-            # 開始事務並優化設定
-            cursor.execute("BEGIN TRANSACTION")
+            # 優化設定必須在事務開始前執行（SQLite不允許在事務中變更synchronous）
             cursor.execute("PRAGMA synchronous = OFF")
             cursor.execute("PRAGMA journal_mode = MEMORY")
             cursor.execute("PRAGMA cache_size = 10000")
             cursor.execute("PRAGMA temp_store = MEMORY")
-            
-            # 準備批次插入資料
-            data_tuples = []
-            for opt in options_list:
-                data_tuples.append((
-                    opt['product'],
-                    opt['trade_date'],
-                    opt['expiry'],
-                    opt['strike'],
-                    opt['cp'],
-                    opt.get('volume', 0),
-                    opt.get('oi'),
-                    opt.get('raw_oi_text'),
-                    opt.get('session', 'regular'),
-                    opt.get('load_file')
-                ))
+            cursor.execute("BEGIN TRANSACTION")
             
             # 批次插入
-            cursor.executemany('''
-                INSERT OR IGNORE INTO options_raw 
-                (product, trade_date, expiry, strike, cp, volume, oi, raw_oi_text, session, load_file)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', data_tuples)
+            cursor.executemany(insert_sql, data_tuples)
             
             conn.commit()
             affected_rows = cursor.rowcount
@@ -184,103 +265,85 @@ class FinancialDatabase:
             return affected_rows
             
         except Exception as e:
-            logging.error(f"批次插入選擇權資料失敗: {e}")
+            logging.error(f"批次插入{label}資料失敗: {e}")
+            conn.close()
             self._restore_normal_settings()
+            # 讓呼叫端知道這批資料沒有寫入，不可當作0筆靜默略過
+            raise
+    
+    def batch_insert_options_fast(self, options_list: List[Dict[str, Any]]) -> int:
+        """快速批次插入選擇權資料 - 針對大量資料優化"""
+        if not options_list:
             return 0
+        
+        data_tuples = [(
+            opt['product'],
+            opt['trade_date'],
+            opt['expiry'],
+            opt['strike'],
+            opt['cp'],
+            opt.get('volume', 0),
+            opt.get('oi'),
+            opt.get('raw_oi_text'),
+            opt.get('session', 'regular'),
+            opt.get('load_file')
+        ) for opt in options_list]
+        
+        return self._batch_insert_fast('''
+            INSERT OR IGNORE INTO options_raw 
+            (product, trade_date, expiry, strike, cp, volume, oi, raw_oi_text, session, load_file)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', data_tuples, "選擇權")
     
     def batch_insert_futures_fast(self, futures_list: List[Dict[str, Any]]) -> int:
         """快速批次插入期貨資料"""
         if not futures_list:
             return 0
         
-        try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("BEGIN TRANSACTION")
-            cursor.execute("PRAGMA synchronous = OFF")
-            cursor.execute("PRAGMA journal_mode = MEMORY")
-            
-            data_tuples = []
-            for future in futures_list:
-                data_tuples.append((
-                    future['product'],
-                    future['trade_date'],
-                    future['expiry'],
-                    future.get('open'),
-                    future.get('high'),
-                    future.get('low'),
-                    future.get('close'),
-                    future.get('volume', 0),
-                    future.get('oi', 0),
-                    future.get('settlement'),
-                    future.get('session', 'regular'),
-                    future.get('load_file')
-                ))
-            
-            cursor.executemany('''
-                INSERT OR IGNORE INTO futures_raw 
-                (product, trade_date, expiry, open, high, low, close, volume, oi, settlement, session, load_file)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', data_tuples)
-            
-            conn.commit()
-            affected_rows = cursor.rowcount
-            conn.close()
-            
-            self._restore_normal_settings()
-            return affected_rows
-            
-        except Exception as e:
-            logging.error(f"批次插入期貨資料失敗: {e}")
-            self._restore_normal_settings()
-            return 0
+        data_tuples = [(
+            future['product'],
+            future['trade_date'],
+            future['expiry'],
+            future.get('open'),
+            future.get('high'),
+            future.get('low'),
+            future.get('close'),
+            future.get('volume', 0),
+            future.get('oi', 0),
+            future.get('settlement'),
+            future.get('session', 'regular'),
+            future.get('load_file')
+        ) for future in futures_list]
+        
+        return self._batch_insert_fast('''
+            INSERT OR IGNORE INTO futures_raw 
+            (product, trade_date, expiry, open, high, low, close, volume, oi, settlement, session, load_file)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', data_tuples, "期貨")
     
     def batch_insert_stocks_fast(self, stocks_list: List[Dict[str, Any]]) -> int:
         """快速批次插入股票資料"""
         if not stocks_list:
             return 0
         
-        try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("BEGIN TRANSACTION")
-            cursor.execute("PRAGMA synchronous = OFF")
-            cursor.execute("PRAGMA journal_mode = MEMORY")
-            
-            data_tuples = []
-            for stock in stocks_list:
-                data_tuples.append((
-                    stock['symbol'],
-                    stock.get('chinese_name'),
-                    stock['trade_date'],
-                    stock.get('open'),
-                    stock.get('high'),
-                    stock.get('low'),
-                    stock.get('close'),
-                    stock.get('volume', 0),
-                    stock.get('value', 0),
-                    stock.get('load_file')
-                ))
-            
-            cursor.executemany('''
-                INSERT OR IGNORE INTO stocks_raw 
-                (symbol, chinese_name, trade_date, open, high, low, close, volume, value, load_file)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', data_tuples)
-            
-            conn.commit()
-            affected_rows = cursor.rowcount
-            conn.close()
-            
-            self._restore_normal_settings()
-            return affected_rows
-            
-        except Exception as e:
-            logging.error(f"批次插入股票資料失敗: {e}")
-            self._restore_normal_settings()
-            return 0
+        data_tuples = [(
+            stock['symbol'],
+            stock.get('chinese_name'),
+            stock['trade_date'],
+            stock.get('open'),
+            stock.get('high'),
+            stock.get('low'),
+            stock.get('close'),
+            stock.get('volume', 0),
+            stock.get('value', 0),
+            stock.get('load_file')
+        ) for stock in stocks_list]
+        
+        return self._batch_insert_fast('''
+            INSERT OR IGNORE INTO stocks_raw 
+            (symbol, chinese_name, trade_date, open, high, low, close, volume, value, load_file)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', data_tuples, "股票")
     
     # === 查詢操作 ===
     def query_options(self, product=None, trade_date=None, expiry=None):
@@ -348,25 +411,12 @@ class FinancialDatabase:
         
         info = {}
         
-        # 取得各表格資料筆數
-        cursor.execute("SELECT COUNT(*) FROM options_raw")
-        info['options_count'] = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM futures_raw")
-        info['futures_count'] = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM stocks_raw")
-        info['stocks_count'] = cursor.fetchone()[0]
-        
-        # 取得資料日期範圍
-        cursor.execute("SELECT MIN(trade_date), MAX(trade_date) FROM options_raw")
-        info['options_date_range'] = cursor.fetchone()
-        
-        cursor.execute("SELECT MIN(trade_date), MAX(trade_date) FROM futures_raw")
-        info['futures_date_range'] = cursor.fetchone()
-        
-        cursor.execute("SELECT MIN(trade_date), MAX(trade_date) FROM stocks_raw")
-        info['stocks_date_range'] = cursor.fetchone()
+        # 每個表格只掃描一次，同時取得資料筆數與日期範圍
+        for prefix, table in (('options', 'options_raw'), ('futures', 'futures_raw'), ('stocks', 'stocks_raw')):
+            cursor.execute(f"SELECT COUNT(*), MIN(trade_date), MAX(trade_date) FROM {table}")
+            count, min_date, max_date = cursor.fetchone()
+            info[f'{prefix}_count'] = count
+            info[f'{prefix}_date_range'] = (min_date, max_date)
         
         conn.close()
         return info
@@ -390,6 +440,12 @@ class EnhancedTXODataScraper:
         
         # 初始化金融資料庫
         self.database = FinancialDatabase()
+        # 同一時間只允許一個資料庫工作（匯入、查詢、匯出），避免讀取交易使匯入的寫入被鎖住
+        self._db_busy = False
+        
+        # HTTP連線依執行緒分開（requests.Session非執行緒安全，背景分析與主執行緒擷取可能同時進行），
+        # 同一執行緒重複擷取時沿用keep-alive連線
+        self._http_local = threading.local()
         
         # 台股資料網址清單
         self.taiwan_market_urls = self.load_market_urls()
@@ -398,57 +454,16 @@ class EnhancedTXODataScraper:
         
     def load_market_urls(self):
         """載入台股市場資料網址清單（分類整理）"""
-        urls = {
-            # === 高頻資料 (HF) ===
-            "HF-選擇權日報表": "https://www.taifex.com.tw/cht/3/optDailyMarketReport",
-            "HF-期貨日報表": "https://www.taifex.com.tw/cht/3/dlFutDailyMarketView",
-            
-            # === 選擇權資料 ===
-            "選擇權-未平倉餘額": "https://www.taifex.com.tw/cht/3/optContractsDate",
-            "選擇權-日報表": "https://www.taifex.com.tw/cht/3/optDailyMarketReport", 
-            "選擇權-歷史資料": "https://www.taifex.com.tw/cht/3/optPrevious30DaysSalesData",
-            "選擇權-買賣權分計": "https://www.taifex.com.tw/cht/3/callsAndPutsDate",
-            
-            # === 期貨資料 ===
-            "期貨-日報表": "https://www.taifex.com.tw/cht/3/futDailyMarketReport",
-            "期貨-歷史資料": "https://www.taifex.com.tw/cht/3/futPrevious30DaysSalesData",
-            "期貨-未平倉餘額": "https://www.taifex.com.tw/cht/3/futContractsDate",
-            
-            # === 三大法人 ===
-            "法人-期貨未平倉": "https://www.taifex.com.tw/cht/3/futContractsDate",
-            "法人-選擇權未平倉": "https://www.taifex.com.tw/cht/3/optContractsDate",
-            "法人-外資未平倉": "https://www.taifex.com.tw/cht/3/internationalTreats",
-            
-            # === 盤後資料下載 ===
-            "盤後-期貨資料": "https://www.taifex.com.tw/cht/3/dlFutDataDown",
-            "盤後-選擇權資料": "https://www.taifex.com.tw/cht/3/dlOptDataDown",
-            "盤後-每筆成交": "https://www.taifex.com.tw/cht/3/dlFutTxfDown",
-            
-            # === 指數與波動率 ===
-            "指數-波動率指數": "https://www.taifex.com.tw/cht/7/vixChart",
-            "指數-盤後行情": "https://www.taifex.com.tw/cht/3/futMarketReport",
-            
-            # === 證交所資料 ===
-            "證交所-個股日成交": "https://www.twse.com.tw/zh/page/trading/exchange/STOCK_DAY.html",
-            "證交所-三大法人": "https://www.twse.com.tw/zh/page/trading/fund/BFI82U.html",
-            "證交所-融資融券": "https://www.twse.com.tw/zh/page/trading/exchange/MI_MARGN.html",
-            "證交所-股價指數": "https://www.twse.com.tw/zh/page/trading/indices/MI_5MINS_HIST.html",
-            "證交所-個股週轉率": "https://www.twse.com.tw/zh/page/trading/exchange/STOCK_DAY_AVG.html",
-            
-            # === 櫃買中心 ===
-            "櫃買-個股日成交": "https://www.tpex.org.tw/web/stock/aftertrading/daily_trading_info/st43_result.php",
-            "櫃買-三大法人": "https://www.tpex.org.tw/web/stock/3insti/3insti_summary/3itrdsum_result.php",
-            
-            # === 公開資訊觀測站 ===
-            "公開資訊-財務報表": "https://mops.twse.com.tw/mops/web/t51sb01",
-            
-            # === Yahoo Finance ===
-            "YF-台股大盤": "https://finance.yahoo.com/quote/%5ETWII/history/",
-            "YF-台積電": "https://finance.yahoo.com/quote/2330.TW/history/",
-            "YF-聯發科": "https://finance.yahoo.com/quote/2454.TW/history/",
-            "YF-鴻海": "https://finance.yahoo.com/quote/2317.TW/history/"
-        }
-        return urls
+        return _TAIWAN_MARKET_URLS
+
+    def _get_http_session(self):
+        """取得目前執行緒專用的HTTP連線"""
+        session = getattr(self._http_local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(_REQUEST_HEADERS)
+            self._http_local.session = session
+        return session
 
     def setup_gui(self):
         """設定圖形化使用者介面"""
@@ -519,9 +534,13 @@ class EnhancedTXODataScraper:
             ("🔍 查詢股票", self.query_stocks),
         ]
         
+        # 保留資料庫按鈕，資料庫工作執行期間（匯入會呼叫root.update()處理事件）全部停用避免穿插執行
+        self.db_buttons = []
         for text, command in buttons_row2:
-            tk.Button(button_frame2, text=text, font=self.font_style, 
-                     command=command, bg='lightblue', fg='black').pack(side=tk.LEFT, padx=2)
+            button = tk.Button(button_frame2, text=text, font=self.font_style, 
+                     command=command, bg='lightblue', fg='black')
+            button.pack(side=tk.LEFT, padx=2)
+            self.db_buttons.append(button)
         
         # 結果顯示區域
         result_frame = tk.Frame(main_frame, bg='black')
@@ -592,7 +611,8 @@ class EnhancedTXODataScraper:
     def update_status(self, message):
         """更新狀態欄"""
         self.status_var.set(message)
-        self.root.update()
+        # 只重繪畫面，不處理使用者事件（避免每次更新狀態都重新進入事件迴圈）
+        self.root.update_idletasks()
 
     def analyze_download_links(self):
         """分析網頁中的下載連結"""
@@ -709,14 +729,7 @@ class EnhancedTXODataScraper:
     def monitor_requests(self, target_url):
         """監控網頁請求"""
         try:
-            session = requests.Session()
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'zh-TW,zh;q=0.9,en;q=0.8',
-            }
-            
-            response = session.get(target_url, headers=headers)
+            response = self._get_http_session().get(target_url)
             response.encoding = 'utf-8'
             
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -827,14 +840,8 @@ class EnhancedTXODataScraper:
             self.update_status("正在連接網站...")
             self.current_url = url
             
-            # 設定請求頭
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            }
-            
             # 發送請求
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self._get_http_session().get(url, timeout=30)
             response.encoding = 'utf-8'
             response.raise_for_status()
             
@@ -944,71 +951,134 @@ class EnhancedTXODataScraper:
             
         self.structured_text.delete(1.0, tk.END)
         
+        # 先組成完整文字再一次插入，減少Tk呼叫次數
+        lines = []
+        
         # 顯示元資料
         metadata = self.structured_data['metadata']
-        self.structured_text.insert(tk.END, "=== 元資料 ===\n")
-        self.structured_text.insert(tk.END, f"來源網址: {metadata['source_url']}\n")
-        self.structured_text.insert(tk.END, f"擷取時間: {metadata['scrape_time']}\n")
-        self.structured_text.insert(tk.END, f"表格數量: {metadata['total_tables']}\n\n")
+        lines.append("=== 元資料 ===")
+        lines.append(f"來源網址: {metadata['source_url']}")
+        lines.append(f"擷取時間: {metadata['scrape_time']}")
+        lines.append(f"表格數量: {metadata['total_tables']}\n")
         
         # 顯示每個表格的結構化資料
         for table in self.structured_data['tables']:
-            self.structured_text.insert(tk.END, f"=== 表格 {table['table_index']} ===\n")
-            self.structured_text.insert(tk.END, f"欄位: {table['columns']}\n")
-            self.structured_text.insert(tk.END, f"資料筆數: {table['row_count']}\n")
-            self.structured_text.insert(tk.END, "前5筆資料:\n")
+            lines.append(f"=== 表格 {table['table_index']} ===")
+            lines.append(f"欄位: {table['columns']}")
+            lines.append(f"資料筆數: {table['row_count']}")
+            lines.append("前5筆資料:")
             
             # 顯示前5筆資料
             for i, row in enumerate(table['data'][:5]):
-                self.structured_text.insert(tk.END, f"第{i+1}筆: {row}\n")
+                lines.append(f"第{i+1}筆: {row}")
             
-            self.structured_text.insert(tk.END, "\n")
+            lines.append("")
+        
+        self.structured_text.insert(tk.END, "\n".join(lines) + "\n")
 
     def export_structured_json(self):
         """匯出結構化JSON資料"""
         if not self.structured_data:
             messagebox.showwarning("警告", "沒有可匯出的結構化資料")
             return
-            
-        try:
-            filename = f"Data/structured_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            
+        
+        data = self.structured_data
+        filename = f"Data/structured_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        
+        def write_json():
             with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(self.structured_data, f, ensure_ascii=False, indent=2)
-            
-            messagebox.showinfo("成功", f"結構化資料已匯出至: {filename}")
-            self.update_status(f"JSON匯出完成: {filename}")
-            
-        except Exception as e:
-            error_msg = f"匯出JSON失敗: {e}"
-            messagebox.showerror("錯誤", error_msg)
+                json.dump(data, f, ensure_ascii=False, indent=2)
+        
+        self._run_in_background(
+            write_json,
+            lambda _: self._export_done(f"結構化資料已匯出至: {filename}", f"JSON匯出完成: {filename}"),
+            "正在匯出JSON...", "匯出JSON失敗")
 
     def export_structured_csv(self):
         """匯出結構化CSV資料"""
         if not self.structured_data:
             messagebox.showwarning("警告", "沒有可匯出的結構化資料")
             return
-            
-        try:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            
-            for table in self.structured_data['tables']:
+        
+        tables = self.structured_data['tables']
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        
+        def write_csv():
+            for table in tables:
                 filename = f"Data/table_{table['table_index']}_{timestamp}.csv"
                 
                 # 轉換為DataFrame
                 df = pd.DataFrame(table['data'])
-                df.to_csv(filename, index=False, encoding='utf-8-sig')
-            
-            messagebox.showinfo("成功", f"CSV資料已匯出至Data資料夾")
-            self.update_status("CSV匯出完成")
-            
+                _EXPORTERS['.csv'](df, filename)
+        
+        self._run_in_background(
+            write_csv,
+            lambda _: self._export_done("CSV資料已匯出至Data資料夾", "CSV匯出完成"),
+            "正在匯出CSV...", "匯出CSV失敗")
+
+    def _run_in_background(self, task, on_done, start_msg, error_prefix, uses_db=False):
+        """在背景執行耗時工作（匯出、查詢），完成後回到主執行緒以結果呼叫on_done，避免凍結介面
+        
+        uses_db為True時佔用資料庫，執行期間拒絕其他資料庫工作
+        """
+        if uses_db and not self._begin_db_job():
+            return
+        self.update_status(start_msg)
+        thread = threading.Thread(target=self._background_worker,
+                                  args=(task, on_done, error_prefix, uses_db))
+        thread.daemon = True
+        thread.start()
+
+    def _background_worker(self, task, on_done, error_prefix, uses_db):
+        """在背景執行工作"""
+        try:
+            result = task()
+            self.root.after(0, self._background_done, on_done, result, uses_db)
         except Exception as e:
-            error_msg = f"匯出CSV失敗: {e}"
-            messagebox.showerror("錯誤", error_msg)
+            self.root.after(0, self._background_failed, error_prefix, str(e), uses_db)
+
+    def _background_done(self, on_done, result, uses_db):
+        """背景工作完成處理"""
+        if uses_db:
+            self._end_db_job()
+        on_done(result)
+
+    def _background_failed(self, error_prefix, error_msg, uses_db):
+        """背景工作失敗處理"""
+        if uses_db:
+            self._end_db_job()
+        self.update_status(error_prefix)
+        messagebox.showerror("錯誤", f"{error_prefix}: {error_msg}")
+
+    def _export_done(self, info_msg, status_msg):
+        """匯出完成處理"""
+        messagebox.showinfo("成功", info_msg)
+        self.update_status(status_msg)
 
     # === 資料庫相關方法（改進版本）===
+    def _set_db_buttons_state(self, state):
+        """設定所有資料庫按鈕的狀態"""
+        for button in self.db_buttons:
+            button.config(state=state)
+
+    def _begin_db_job(self):
+        """開始資料庫工作；已有工作執行中時提示使用者並回傳False"""
+        if self._db_busy:
+            messagebox.showwarning("警告", "資料庫正在處理其他工作，請稍後再試")
+            return False
+        self._db_busy = True
+        self._set_db_buttons_state(tk.DISABLED)
+        return True
+
+    def _end_db_job(self):
+        """結束資料庫工作"""
+        self._db_busy = False
+        self._set_db_buttons_state(tk.NORMAL)
+
     def show_database_info(self):
         """顯示資料庫資訊"""
+        if not self._begin_db_job():
+            return
         try:
             info = self.database.get_database_info()
             
@@ -1034,47 +1104,61 @@ class EnhancedTXODataScraper:
             
         except Exception as e:
             messagebox.showerror("錯誤", f"取得資料庫資訊失敗: {e}")
+        finally:
+            self._end_db_job()
 
     def import_csv_to_database(self):
-        """快速匯入CSV檔案到資料庫 - 改進的智能分類邏輯"""
+        """快速匯入CSV檔案到資料庫 - 改進的智能分類邏輯（可一次選擇多個檔案）"""
+        file_paths = filedialog.askopenfilenames(
+            title="選擇CSV檔案",
+            filetypes=[("CSV檔案", "*.csv"), ("所有檔案", "*.*")],
+            initialdir="Data"
+        )
+        
+        if not file_paths:
+            return
+        
+        if not self._begin_db_job():
+            return
+        filename = None
+        files_imported = 0
         try:
-            file_path = filedialog.askopenfilename(
-                title="選擇CSV檔案",
-                filetypes=[("CSV檔案", "*.csv"), ("所有檔案", "*.*")],
-                initialdir="Data"
-            )
-            
-            if not file_path:
-                return
-            
-            file_size = os.path.getsize(file_path) / (1024 * 1024)  # MB
-            self.update_status(f"開始匯入 {file_size:.1f}MB 的CSV檔案...")
-            
-            # 根據檔案大小決定chunk大小
-            chunk_size = 50000 if file_size > 10 else 10000
-            
             total_imported = 0
             start_time = datetime.now()
             
-            # 分批讀取大檔案
-            for chunk_num, chunk_df in enumerate(pd.read_csv(file_path, chunksize=chunk_size)):
-                self.update_status(f"處理第 {chunk_num + 1} 批資料 ({len(chunk_df)} 筆)...")
-                
+            # 依序匯入每個檔案（SQLite寫入本身會序列化，平行讀檔沒有幫助）
+            for file_num, file_path in enumerate(file_paths, 1):
+                file_size = os.path.getsize(file_path) / (1024 * 1024)  # MB
                 filename = os.path.basename(file_path)
-                import_count = self._process_data_chunk_fast(chunk_df, filename)
-                total_imported += import_count
+                self.update_status(f"開始匯入 ({file_num}/{len(file_paths)}) {filename} {file_size:.1f}MB...")
+                
+                # 根據檔案大小決定chunk大小
+                chunk_size = 50000 if file_size > 10 else 10000
+                
+                # 每個檔案重新判斷資料類型；匯入方式只存在本地變數，由第一批資料決定後續批次沿用
+                import_plan = None
                 
-                # 顯示進度
-                elapsed = (datetime.now() - start_time).total_seconds()
-                rate = total_imported / elapsed if elapsed > 0 else 0
-                self.update_status(f"已處理: {total_imported:,} 筆, 速度: {rate:.1f} 筆/秒")
+                # 分批讀取大檔案
+                for chunk_num, chunk_df in enumerate(pd.read_csv(file_path, chunksize=chunk_size)):
+                    self.update_status(f"{filename}: 處理第 {chunk_num + 1} 批資料 ({len(chunk_df)} 筆)...")
+                    
+                    import_count, import_plan = self._process_data_chunk_fast(chunk_df, filename, import_plan)
+                    total_imported += import_count
+                    
+                    # 顯示進度
+                    elapsed = (datetime.now() - start_time).total_seconds()
+                    rate = total_imported / elapsed if elapsed > 0 else 0
+                    self.update_status(f"已處理: {total_imported:,} 筆, 速度: {rate:.1f} 筆/秒")
+                    
+                    # 更新介面
+                    self.root.update()
                 
-                # 更新介面
-                self.root.update()
+                files_imported += 1
             
             elapsed_time = (datetime.now() - start_time).total_seconds()
             messagebox.showinfo("完成", 
                               f"匯入完成！\n"
+                              f"匯入檔案: {len(file_paths)} 個\n"
                               f"總共匯入: {total_imported:,} 筆資料\n"
                               f"花費時間: {elapsed_time:.1f} 秒\n"
                               f"平均速度: {total_imported/elapsed_time:.1f} 筆/秒")
@@ -1082,11 +1166,23 @@ class EnhancedTXODataScraper:
             self.update_status(f"快速匯入完成: {total_imported:,} 筆資料")
             
         except Exception as e:
-            messagebox.showerror("錯誤", f"匯入CSV失敗: {e}")
+            messagebox.showerror("錯誤", 
+                               f"匯入CSV失敗: {e}\n"
+                               f"失敗檔案: {filename}\n"
+                               f"已完成匯入: {files_imported}/{len(file_paths)} 個檔案")
             self.update_status("匯入失敗")
+        finally:
+            self._end_db_job()
     
-    def _process_data_chunk_fast(self, chunk_df, filename):
-        """改進的自動分類邏輯 - 同時檢查第一列和第二列，保存股票代號資訊"""
+    def _process_data_chunk_fast(self, chunk_df, filename, import_plan=None):
+        """改進的自動分類邏輯 - 同時檢查第一列和第二列，保存股票代號資訊
+        
+        回傳 (匯入筆數, 匯入方式)；呼叫端將匯入方式傳回給同一檔案的後續批次
+        """
+        
+        # 同一檔案的後續批次直接沿用第一批的判斷結果，不重複分析欄位或詢問使用者
+        if import_plan is not None:
+            return import_plan(chunk_df, filename), import_plan
         
         # 保存原始的第0行內容（可能包含股票代號）
         original_first_row = None
@@ -1116,40 +1212,36 @@ class EnhancedTXODataScraper:
             # 從被跳過的第0行和第1行提取股票代號
             symbol_info = self._extract_symbol_from_skipped_rows(chunk_df.columns.tolist(), original_first_row)
             
-            # 重新建立DataFrame（跳過第0行）
-            chunk_df = chunk_df.iloc[1:].reset_index(drop=True)
+            # 跳過第0行（後續只用位置存取，不需重建索引複製整批資料）
+            chunk_df = chunk_df.iloc[1:]
             self.update_status("使用第二列作為欄位名稱，跳過第一行文字說明")
         
         # 3. 計算各類資料分數
-        option_indicators = {'cp', 'call/put', '買賣權', 'strike', '履約價', 'expiry', '到期'}
-        future_indicators = {'settlement', '結算價', 'oi', '未平倉', '留倉'}
-        stock_indicators = {'open', 'high', 'low', 'close', 'volume', 'value', '成交金額', '開盤', '最高', '最低', '收盤', '成交量'}
-        
-        option_score = len(column_names & option_indicators)
-        future_score = len(column_names & future_indicators) 
-        stock_score = len(column_names & stock_indicators)
+        option_score = len(column_names & _OPTION_INDICATORS)
+        future_score = len(column_names & _FUTURE_INDICATORS)
+        stock_score = len(column_names & _STOCK_INDICATORS)
         
         # 4. 根據分數決定資料類型
         if option_score >= 2:
             self.update_status(f"識別為選擇權資料 (分數: {option_score})")
-            return self._import_as_options(chunk_df, filename)
+            return self._import_with_plan(self._import_as_options, chunk_df, filename)
             
         elif future_score >= 2 and option_score == 0:
             self.update_status(f"識別為期貨資料 (分數: {future_score})")
-            return self._import_as_futures(chunk_df, filename)
+            return self._import_with_plan(self._import_as_futures, chunk_df, filename)
             
         elif stock_score >= 2 and option_score == 0 and future_score == 0:
             self.update_status(f"識別為股票資料 (分數: {stock_score})")
             # 如果是股票資料，使用提取的股票代號資訊
             if symbol_info:
-                return self._import_as_stocks_with_symbol(chunk_df, filename, symbol_info)
+                return self._import_with_plan(self._stocks_with_symbol_plan(symbol_info), chunk_df, filename)
             else:
                 # 即使使用第一列作為欄位名稱，也可能包含股票代號
                 if data_start_index == 0:
                     symbol_info = self._extract_symbol_from_header(chunk_df.columns.tolist())
                     if symbol_info:
-                        return self._import_as_stocks_with_symbol(chunk_df, filename, symbol_info)
-                return self._import_as_stocks(chunk_df, filename)
+                        return self._import_with_plan(self._stocks_with_symbol_plan(symbol_info), chunk_df, filename)
+                return self._import_with_plan(self._import_as_stocks, chunk_df, filename)
             
         else:
             # 無法明確判斷，嘗試股票代號自動辨識
@@ -1157,7 +1249,7 @@ class EnhancedTXODataScraper:
             symbol_info = self._auto_detect_stock_symbol(chunk_df)
             if symbol_info:
                 self.update_status(f"第二層辨識成功: {symbol_info['symbol']} {symbol_info['chinese_name']}")
-                return self._import_as_stocks_with_symbol(chunk_df, filename, symbol_info)
+                return self._import_with_plan(self._stocks_with_symbol_plan(symbol_info), chunk_df, filename)
             else:
                 # 讓使用者選擇
                 return self._ask_user_for_data_type(chunk_df, filename)
@@ -1173,19 +1265,9 @@ class EnhancedTXODataScraper:
 
     def _extract_symbol_from_header(self, header_columns):
         """從表頭辨識股票代號 - 精確版本"""
-        import re
-        
         for i, col in enumerate(header_columns):
             if isinstance(col, str):
-                # 精確正則：在整個字串中尋找「空格或開頭 + 數字代號 + 空格 + 中文名稱」
-                pattern = r'(?:\s|^)(\d{3,6}[A-Za-z]*)\s+([\u4e00-\u9fff]+)'
-                # 解釋：
-                # (?:\s|^) → 空格或字串開頭（非捕獲組）
-                # (\d{3,6}[A-Za-z]*) → 3-6位數字，可能包含英文（股票代號）
-                # \s+ → 1個或多個空格
-                # ([\u4e00-\u9fff]+) → 中文名稱
-                
-                match = re.search(pattern, col)
+                match = _SYMBOL_PATTERN.search(col)
                 
                 if match:
                     symbol = match.group(1).strip()
@@ -1204,13 +1286,9 @@ class EnhancedTXODataScraper:
 
     def _extract_symbol_from_data(self, data_row):
         """從資料行辨識股票代號"""
-        import re
-        
         for i, cell in enumerate(data_row):
             if isinstance(cell, str):
-                # 同樣的精確正則
-                pattern = r'(?:\s|^)(\d{3,6}[A-Za-z]*)\s+([\u4e00-\u9fff]+)'
-                match = re.search(pattern, cell)
+                match = _SYMBOL_PATTERN.search(cell)
                 
                 if match:
                     symbol = match.group(1).strip()
@@ -1228,14 +1306,12 @@ class EnhancedTXODataScraper:
 
     def _is_valid_tw_stock_symbol(self, symbol):
         """驗證是否為有效的台股股票代號"""
-        import re
-        
         # 長度檢查
         if len(symbol) < 3 or len(symbol) > 6:
             return False
         
         # 格式檢查：必須以數字開頭，可能包含英文
-        if not re.match(r'^\d+[A-Za-z]*$', symbol):
+        if not _SYMBOL_FORMAT.match(symbol):
             return False
         
         # 常見的台股代號長度
@@ -1252,37 +1328,18 @@ class EnhancedTXODataScraper:
         score = 0
         column_texts = [str(col).lower() for col in columns]
         
-        # 常見的股票資料欄位關鍵字
-        stock_keywords = {
-            'open', 'high', 'low', 'close', 'volume', 'value',
-            '開盤', '最高', '最低', '收盤', '成交量', '成交金額',
-            '日期', 'date', '代號', 'symbol', '名稱', 'name'
-        }
-        
-        # 常見的選擇權/期貨欄位關鍵字
-        option_future_keywords = {
-            'cp', 'call', 'put', 'strike', '履約價', 'expiry', '到期',
-            'settlement', '結算價', 'oi', '未平倉', '留倉'
-        }
-        
-        # 常見的非欄位名稱文字（文字說明）
-        non_column_keywords = {
-            '報告', '報表', '資料', '統計', '明細', '表', '年度', '月份',
-            '公司', '股票', '證券', '交易', '市場', '行情', '投資'
-        }
-        
         # 計算分數
         for text in column_texts:
             # 如果包含股票欄位關鍵字，加分
-            if any(keyword in text for keyword in stock_keywords):
+            if any(keyword in text for keyword in _STOCK_KEYWORDS):
                 score += 2
             
             # 如果包含選擇權/期貨關鍵字，加分
-            if any(keyword in text for keyword in option_future_keywords):
+            if any(keyword in text for keyword in _OPTION_FUTURE_KEYWORDS):
                 score += 2
                 
             # 如果看起來像欄位名稱（簡短、英文或簡短中文）
-            if len(text) <= 12 and not any(non_word in text for non_word in non_column_keywords):
+            if len(text) <= 12 and not any(non_word in text for non_word in _NON_COLUMN_KEYWORDS):
                 score += 1
                 
             # 如果看起來像資料內容（長文字、數字等），減分
@@ -1332,21 +1389,32 @@ class EnhancedTXODataScraper:
         )
         
         if choice == '1':
-            return self._import_as_options(chunk_df, filename)
+            return self._import_with_plan(self._import_as_options, chunk_df, filename)
         elif choice == '2':
-            return self._import_as_futures(chunk_df, filename)
+            return self._import_with_plan(self._import_as_futures, chunk_df, filename)
         elif choice == '3':
-            return self._import_as_stocks(chunk_df, filename)
+            return self._import_with_plan(self._import_as_stocks, chunk_df, filename)
         else:
-            return 0
+            # 使用者取消時略過整個檔案，避免每一批都再詢問一次
+            return self._import_with_plan(lambda df, fn: 0, chunk_df, filename)
+
+    def _import_with_plan(self, import_func, chunk_df, filename):
+        """以決定的匯入方式匯入目前這一批資料，回傳 (匯入筆數, 匯入方式)"""
+        return import_func(chunk_df, filename), import_func
+
+    def _stocks_with_symbol_plan(self, symbol_info):
+        """建立帶有股票代號的股票匯入方式"""
+        return lambda df, fn: self._import_as_stocks_with_symbol(df, fn, symbol_info)
 
     def _import_as_options(self, chunk_df, filename):
         """匯入選擇權資料"""
+        # 預設交易日期每批只格式化一次，不在每筆資料重算
+        today = datetime.now().strftime('%Y-%m-%d')
         options_list = []
-        for _, row in chunk_df.iterrows():
+        for row in chunk_df.to_dict('records'):
             options_list.append({
                 'product': row.get('product', 'TXO'),
-                'trade_date': row.get('trade_date', datetime.now().strftime('%Y-%m-%d')),
+                'trade_date': row.get('trade_date', today),
                 'expiry': row.get('expiry', ''),
                 'strike': row.get('strike', 0),
                 'cp': row.get('cp', 'C'),
@@ -1360,11 +1428,12 @@ class EnhancedTXODataScraper:
 
     def _import_as_futures(self, chunk_df, filename):
         """匯入期貨資料"""
+        today = datetime.now().strftime('%Y-%m-%d')
         futures_list = []
-        for _, row in chunk_df.iterrows():
+        for row in chunk_df.to_dict('records'):
             futures_list.append({
                 'product': row.get('product', 'TXF'),
-                'trade_date': row.get('trade_date', datetime.now().strftime('%Y-%m-%d')),
+                'trade_date': row.get('trade_date', today),
                 'expiry': row.get('expiry', ''),
                 'open': row.get('open'),
                 'high': row.get('high'),
@@ -1380,11 +1449,12 @@ class EnhancedTXODataScraper:
 
     def _import_as_stocks(self, chunk_df, filename):
         """匯入股票資料"""
+        today = datetime.now().strftime('%Y-%m-%d')
         stocks_list = []
-        for _, row in chunk_df.iterrows():
+        for row in chunk_df.to_dict('records'):
             stocks_list.append({
                 'symbol': row.get('symbol', ''),
-                'trade_date': row.get('trade_date', datetime.now().strftime('%Y-%m-%d')),
+                'trade_date': row.get('trade_date', today),
                 'open': row.get('open'),
                 'high': row.get('high'),
                 'low': row.get('low'),
@@ -1398,12 +1468,13 @@ class EnhancedTXODataScraper:
 
     def _import_as_stocks_with_symbol(self, chunk_df, filename, symbol_info):
         """使用自動辨識的股票代號匯入股票資料"""
+        today = datetime.now().strftime('%Y-%m-%d')
         stocks_list = []
-        for _, row in chunk_df.iterrows():
+        for row in chunk_df.to_dict('records'):
             stocks_list.append({
                 'symbol': symbol_info['symbol'],
                 'chinese_name': symbol_info['chinese_name'],
-                'trade_date': row.get('trade_date', datetime.now().strftime('%Y-%m-%d')),
+                'trade_date': row.get('trade_date', today),
                 'open': row.get('open'),
                 'high': row.get('high'),
                 'low': row.get('low'),
@@ -1422,43 +1493,86 @@ class EnhancedTXODataScraper:
             export_type = simpledialog.askstring("匯出查詢", "請輸入查詢類型 (options/futures/stocks):")
             if not export_type:
                 return
-                
-            # 執行查詢
-            if export_type.lower() == 'options':
-                df = self.database.query_options()
-            elif export_type.lower() == 'futures':
-                df = self.database.query_futures()
-            elif export_type.lower() == 'stocks':
-                df = self.database.query_stocks()
-            else:
+            
+            query_funcs = {
+                'options': self.database.query_options,
+                'futures': self.database.query_futures,
+                'stocks': self.database.query_stocks,
+            }
+            query_func = query_funcs.get(export_type.lower())
+            if query_func is None:
                 messagebox.showwarning("警告", "不支援的查詢類型")
                 return
             
-            # 匯出檔案
-            filename = f"Data/{export_type}_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            df.to_csv(filename, index=False, encoding='utf-8-sig')
+            # 匯出檔案（依副檔名選擇格式）
+            filename = filedialog.asksaveasfilename(
+                title="匯出查詢結果",
+                initialdir="Data",
+                initialfile=f"{export_type}_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                defaultextension=".csv",
+                filetypes=[("CSV檔案", "*.csv"), ("Excel檔案", "*.xlsx"), ("JSON檔案", "*.json")]
+            )
+            if not filename:
+                return
             
-            messagebox.showinfo("成功", f"查詢結果已匯出至: {filename}")
-            self.update_status(f"資料庫查詢結果已匯出: {filename}")
+            ext = os.path.splitext(filename)[1].lower()
+            if ext not in _EXPORTERS:
+                messagebox.showwarning("警告", f"不支援的匯出格式: {ext}")
+                return
+            
+            # 查詢與匯出都在背景執行，避免大量資料凍結介面
+            exporter = _EXPORTERS[ext]
+            self._run_in_background(
+                lambda: exporter(query_func(), filename),
+                lambda _: self._export_done(f"查詢結果已匯出至: {filename}", f"資料庫查詢結果已匯出: {filename}"),
+                f"正在匯出查詢結果: {filename}", "匯出查詢失敗", uses_db=True)
             
         except Exception as e:
             messagebox.showerror("錯誤", f"匯出查詢失敗: {e}")
 
+    def _display_query_result(self, title, df, shown=_QUERY_PAGE_SIZE):
+        """在資料庫分頁顯示查詢結果，只渲染前shown筆以避免大量結果拖慢介面，其餘資料分頁載入"""
+        shown = min(shown, len(df))
+        content = f"=== {title}查詢結果 ===\n\n"
+        content += f"找到 {len(df)} 筆資料，目前顯示 {shown:,} 筆\n\n"
+        content += df.head(shown).to_string()
+        
+        self.database_text.delete(1.0, tk.END)
+        self.database_text.insert(tk.END, content)
+        
+        # 尚有未顯示的資料時，加入可點選的「顯示下一頁」連結
+        if shown < len(df):
+            self.database_text.insert(tk.END, "\n\n")
+            self.database_text.insert(tk.END, f"▶ 顯示下一頁（下 {min(_QUERY_PAGE_SIZE, len(df) - shown):,} 筆）", "query_next_page")
+            self.database_text.tag_config("query_next_page", foreground='cyan', underline=True)
+            self.database_text.tag_bind("query_next_page", "<Button-1>",
+                                        lambda event: self._show_next_query_page(title, df, shown))
+        self.notebook.select(3)
+
+    def _show_next_query_page(self, title, df, shown):
+        """多顯示一頁查詢結果，並捲動到新載入的第一筆"""
+        self._display_query_result(title, df, shown + _QUERY_PAGE_SIZE)
+        # 前4行為標題與筆數，接著是1行欄位名稱
+        self.database_text.see(f"{shown + 6}.0")
+
+    def _start_query(self, title, query_func):
+        """在背景執行資料庫查詢，完成後回到主執行緒顯示結果"""
+        self._run_in_background(query_func,
+                                lambda df: self._query_done(title, df),
+                                f"正在查詢{title}資料...", f"查詢{title}失敗", uses_db=True)
+
+    def _query_done(self, title, df):
+        """查詢完成處理"""
+        self._display_query_result(title, df)
+        self.update_status(f"{title}查詢完成: {len(df)} 筆資料")
+
     def query_options(self):
         """查詢選擇權資料"""
         try:
             product = simpledialog.askstring("查詢選擇權", "商品代碼 (TXO/CAO/CNO，留空查詢所有):")
             trade_date = simpledialog.askstring("查詢選擇權", "交易日期 (YYYY-MM-DD，留空查詢所有):")
             
-            df = self.database.query_options(product=product, trade_date=trade_date)
-            
-            self.database_text.delete(1.0, tk.END)
-            self.database_text.insert(tk.END, f"=== 選擇權查詢結果 ===\n\n")
-            self.database_text.insert(tk.END, f"找到 {len(df)} 筆資料\n\n")
-            self.database_text.insert(tk.END, df.to_string())
-            
-            self.notebook.select(3)
-            self.update_status(f"選擇權查詢完成: {len(df)} 筆資料")
+            self._start_query("選擇權", lambda: self.database.query_options(product=product, trade_date=trade_date))
             
         except Exception as e:
             messagebox.showerror("錯誤", f"查詢選擇權失敗: {e}")
@@ -1469,15 +1583,7 @@ class EnhancedTXODataScraper:
             product = simpledialog.askstring("查詢期貨", "商品代碼 (TXF/MXF，留空查詢所有):")
             trade_date = simpledialog.askstring("查詢期貨", "交易日期 (YYYY-MM-DD，留空查詢所有):")
             
-            df = self.database.query_futures(product=product, trade_date=trade_date)
-            
-            self.database_text.delete(1.0, tk.END)
-            self.database_text.insert(tk.END, f"=== 期貨查詢結果 ===\n\n")
-            self.database_text.insert(tk.END, f"找到 {len(df)} 筆資料\n\n")
-            self.database_text.insert(tk.END, df.to_string())
-            
-            self.notebook.select(3)
-            self.update_status(f"期貨查詢完成: {len(df)} 筆資料")
+            self._start_query("期貨", lambda: self.database.query_futures(product=product, trade_date=trade_date))
             
         except Exception as e:
             messagebox.showerror("錯誤", f"查詢期貨失敗: {e}")
@@ -1488,15 +1594,7 @@ class EnhancedTXODataScraper:
             symbol = simpledialog.askstring("查詢股票", "股票代碼 (留空查詢所有):")
             trade_date = simpledialog.askstring("查詢股票", "交易日期 (YYYY-MM-DD，留空查詢所有):")
             
-            df = self.database.query_stocks(symbol=symbol, trade_date=trade_date)
-            
-            self.database_text.delete(1.0, tk.END)
-            self.database_text.insert(tk.END, f"=== 股票查詢結果 ===\n\n")
-            self.database_text.insert(tk.END, f"找到 {len(df)} 筆資料\n\n")
-            self.database_text.insert(tk.END, df.to_string())
-            
-            self.notebook.select(3)
-            self.update_status(f"股票查詢完成: {len(df)} 筆資料")
+            self._start_query("股票", lambda: self.database.query_stocks(symbol=symbol, trade_date=trade_date))
             
         except Exception as e:
             messagebox.showerror("錯誤", f"查詢股票失敗: {e}")